@@ -81,6 +81,30 @@ activities = {
 }
 
 
+# Per-activity participant sets for O(1) membership checks; the lists in
+# `activities` keep signup order for the API response
+participant_sets = {}
+
+
+def rebuild_participant_sets():
+    """Rebuild the participant sets from the activity participant lists"""
+    participant_sets.clear()
+    for name, activity in activities.items():
+        participant_sets[name] = set(activity["participants"])
+
+
+def get_participant_set(activity_name):
+    """Return the participant set for an activity, building it if missing"""
+    participant_set = participant_sets.get(activity_name)
+    if participant_set is None:
+        participant_set = set(activities[activity_name]["participants"])
+        participant_sets[activity_name] = participant_set
+    return participant_set
+
+
+rebuild_participant_sets()
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
@@ -98,15 +122,17 @@ def signup_for_activity(activity_name: str, email: str):
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
+    # Get the specific activity and its participant set
     activity = activities[activity_name]
+    participant_set = get_participant_set(activity_name)
 
     # Validate student is not already signed up
-    if email in activity["participants"]:
+    if email in participant_set:
         raise HTTPException(status_code=400, detail="Student is already signed up")
 
     # Add student
     activity["participants"].append(email)
+    participant_set.add(email)
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
@@ -117,13 +143,15 @@ def unregister_from_activity(activity_name: str, email: str):
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
+    # Get the specific activity and its participant set
     activity = activities[activity_name]
+    participant_set = get_participant_set(activity_name)
 
     # Validate student is currently signed up
-    if email not in activity["participants"]:
+    if email not in participant_set:
         raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
 
     # Remove student
     activity["participants"].remove(email)
+    participant_set.remove(email)
     return {"message": f"Unregistered {email} from {activity_name}"}
@@ -0,0 +1,82 @@
+"""
+Shared fixtures for the Mergington High School Activities API tests
+
+Every test starts from a fresh copy of the seed activities, so tests are
+order-independent and can run in parallel with ``pytest -n auto``.
+"""
+
+import copy
+
+import pytest
+import pytest_asyncio
+
+ACTIVITIES_URL = "/activities"
+SIGNUP_URL = "/activities/{}/signup"
+UNREGISTER_URL = "/activities/{}/unregister"
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """Import the application lazily so test collection stays cheap"""
+    from src import app as module
+    return module
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    """Create a single test client for the FastAPI app, shared by all tests
+
+    The client is not entered as a context manager, so lifespan startup and
+    shutdown never run. The app has no lifespan handlers; its seed data is
+    built at import time.
+    """
+    from fastapi.testclient import TestClient
+    return TestClient(app_module.app)
+
+
+@pytest_asyncio.fixture
+async def aclient(app_module):
+    """Create an async client that calls the FastAPI app directly over ASGI"""
+    import httpx
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def _orig_activities(app_module):
+    """Snapshot the seed activities once per session"""
+    return copy.deepcopy(app_module.activities)
+
+
+@pytest.fixture(autouse=True)
+def reset_activities(app_module, _orig_activities):
+    """Restore the seed activities before each test"""
+    app_module.activities.clear()
+    app_module.activities.update(copy.deepcopy(_orig_activities))
+    app_module.rebuild_participant_sets()
+    yield
+
+
+@pytest.fixture(scope="session")
+def list_activities():
+    """Return a helper that fetches all activities through a client"""
+    def list_activities(client):
+        return client.get(ACTIVITIES_URL)
+    return list_activities
+
+
+@pytest.fixture(scope="session")
+def signup():
+    """Return a helper that signs a student up through a client"""
+    def signup(client, activity_name, email):
+        return client.post(SIGNUP_URL.format(activity_name), params={"email": email})
+    return signup
+
+
+@pytest.fixture(scope="session")
+def unregister():
+    """Return a helper that unregisters a student through a client"""
+    def unregister(client, activity_name, email):
+        return client.delete(UNREGISTER_URL.format(activity_name), params={"email": email})
+    return unregister
@@ -3,26 +3,13 @@ Test suite for Mergington High School Activities API
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from src.app import app, activities
-import json
 
 
 @pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
-
-
-@pytest.fixture
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original activities
-    original_activities = activities.copy()
-    
-    # Reset to a known state for testing
-    activities.clear()
-    activities.update({
+def sample_activities(app_module):
+    """Replace the seed activities with a small known set for testing"""
+    app_module.activities.clear()
+    app_module.activities.update({
         "Test Club": {
             "description": "A test club for testing purposes",
             "schedule": "Test Schedule",
@@ -36,300 +23,249 @@ def reset_activities():
             "participants": []
         }
     })
+    app_module.rebuild_participant_sets()
+    return app_module.activities
+
+
+# Root endpoint
+def test_root_redirects_to_static_index(client):
+    """Test that root endpoint redirects to static/index.html"""
+    response = client.get("/", follow_redirects=False)
+    assert response.status_code == 307  # Temporary redirect
+    assert response.headers["location"] == "/static/index.html"
+
+
+# Activities endpoint
+def test_get_activities_success(client, sample_activities, list_activities):
+    """Test successful retrieval of activities"""
+    response = list_activities(client)
     
-    yield
+    assert response.status_code == 200
+    data = response.json()
     
-    # Restore original activities after test
-    activities.clear()
-    activities.update(original_activities)
+    assert "Test Club" in data
+    assert "Empty Club" in data
+    
+    # Verify structure of returned data
+    test_club = data["Test Club"]
+    assert test_club["description"] == "A test club for testing purposes"
+    assert test_club["schedule"] == "Test Schedule"
+    assert test_club["max_participants"] == 5
+    assert len(test_club["participants"]) == 2
+    assert "test1@mergington.edu" in test_club["participants"]
+    assert "test2@mergington.edu" in test_club["participants"]
+    
+    # Verify empty club
+    empty_club = data["Empty Club"]
+    assert len(empty_club["participants"]) == 0
 
 
-class TestRootEndpoint:
-    """Test the root endpoint"""
-    
-    def test_root_redirects_to_static_index(self, client):
-        """Test that root endpoint redirects to static/index.html"""
-        response = client.get("/", follow_redirects=False)
-        assert response.status_code == 307  # Temporary redirect
-        assert response.headers["location"] == "/static/index.html"
+# Signup endpoint
+def test_signup_success(client, sample_activities, signup):
+    """Test successful signup for an activity"""
+    email = "newstudent@mergington.edu"
+    activity_name = "Test Club"
+    
+    response = signup(client, activity_name, email)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["message"] == f"Signed up {email} for {activity_name}"
+    
+    # Verify the participant was actually added
+    assert email in sample_activities[activity_name]["participants"]
 
 
-class TestGetActivities:
-    """Test the activities endpoint"""
+def test_signup_already_registered(client, sample_activities, signup):
+    """Test signup when student is already registered"""
+    email = "test1@mergington.edu"  # Already in Test Club
+    activity_name = "Test Club"
     
-    def test_get_activities_success(self, client, reset_activities):
-        """Test successful retrieval of activities"""
-        response = client.get("/activities")
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert "Test Club" in data
-        assert "Empty Club" in data
-        
-        # Verify structure of returned data
-        test_club = data["Test Club"]
-        assert test_club["description"] == "A test club for testing purposes"
-        assert test_club["schedule"] == "Test Schedule"
-        assert test_club["max_participants"] == 5
-        assert len(test_club["participants"]) == 2
-        assert "test1@mergington.edu" in test_club["participants"]
-        assert "test2@mergington.edu" in test_club["participants"]
-        
-        # Verify empty club
-        empty_club = data["Empty Club"]
-        assert len(empty_club["participants"]) == 0
+    response = signup(client, activity_name, email)
+    
+    assert response.status_code == 400
+    data = response.json()
+    assert data["detail"] == "Student is already signed up"
 
 
-class TestSignupEndpoint:
-    """Test the signup endpoint"""
-    
-    def test_signup_success(self, client, reset_activities):
-        """Test successful signup for an activity"""
-        email = "newstudent@mergington.edu"
-        activity_name = "Test Club"
-        
-        response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["message"] == f"Signed up {email} for {activity_name}"
-        
-        # Verify the participant was actually added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data[activity_name]["participants"]
-    
-    def test_signup_activity_not_found(self, client, reset_activities):
-        """Test signup for non-existent activity"""
-        email = "student@mergington.edu"
-        activity_name = "NonExistent Club"
-        
-        response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert data["detail"] == "Activity not found"
-    
-    def test_signup_already_registered(self, client, reset_activities):
-        """Test signup when student is already registered"""
-        email = "test1@mergington.edu"  # Already in Test Club
-        activity_name = "Test Club"
-        
-        response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert data["detail"] == "Student is already signed up"
-    
-    def test_signup_empty_club(self, client, reset_activities):
-        """Test signup for a club with no existing participants"""
-        email = "newstudent@mergington.edu"
-        activity_name = "Empty Club"
-        
-        response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["message"] == f"Signed up {email} for {activity_name}"
-        
-        # Verify the participant was added to previously empty club
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data[activity_name]["participants"]
-        assert len(activities_data[activity_name]["participants"]) == 1
+def test_signup_empty_club(client, sample_activities, signup):
+    """Test signup for a club with no existing participants"""
+    email = "newstudent@mergington.edu"
+    activity_name = "Empty Club"
+    
+    response = signup(client, activity_name, email)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["message"] == f"Signed up {email} for {activity_name}"
+    
+    # Verify the participant was added to previously empty club
+    participants = sample_activities[activity_name]["participants"]
+    assert email in participants
+    assert len(participants) == 1
 
 
-class TestUnregisterEndpoint:
-    """Test the unregister endpoint"""
-    
-    def test_unregister_success(self, client, reset_activities):
-        """Test successful unregistration from an activity"""
-        email = "test1@mergington.edu"  # Already in Test Club
-        activity_name = "Test Club"
-        
-        response = client.delete(f"/activities/{activity_name}/unregister?email={email}")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["message"] == f"Unregistered {email} from {activity_name}"
-        
-        # Verify the participant was actually removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email not in activities_data[activity_name]["participants"]
-        assert len(activities_data[activity_name]["participants"]) == 1  # Only test2 should remain
-    
-    def test_unregister_activity_not_found(self, client, reset_activities):
-        """Test unregister from non-existent activity"""
-        email = "student@mergington.edu"
-        activity_name = "NonExistent Club"
-        
-        response = client.delete(f"/activities/{activity_name}/unregister?email={email}")
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert data["detail"] == "Activity not found"
-    
-    def test_unregister_not_registered(self, client, reset_activities):
-        """Test unregister when student is not registered"""
-        email = "notregistered@mergington.edu"
-        activity_name = "Test Club"
-        
-        response = client.delete(f"/activities/{activity_name}/unregister?email={email}")
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert data["detail"] == "Student is not signed up for this activity"
-    
-    def test_unregister_from_empty_club(self, client, reset_activities):
-        """Test unregister from club with no participants"""
-        email = "nobody@mergington.edu"
-        activity_name = "Empty Club"
-        
-        response = client.delete(f"/activities/{activity_name}/unregister?email={email}")
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert data["detail"] == "Student is not signed up for this activity"
+# Unregister endpoint
+def test_unregister_success(client, sample_activities, unregister):
+    """Test successful unregistration from an activity"""
+    email = "test1@mergington.edu"  # Already in Test Club
+    activity_name = "Test Club"
+    
+    response = unregister(client, activity_name, email)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["message"] == f"Unregistered {email} from {activity_name}"
+    
+    # Verify the participant was actually removed
+    participants = sample_activities[activity_name]["participants"]
+    assert email not in participants
+    assert len(participants) == 1  # Only test2 should remain
 
 
-class TestEmailHandling:
-    """Test various email formats and edge cases"""
-    
-    def test_signup_with_special_characters_in_email(self, client, reset_activities):
-        """Test signup with special characters in email"""
-        email = "test.user+tag@mergington.edu"
-        activity_name = "Empty Club"
-        
-        # URL encode the email to handle special characters properly
-        from urllib.parse import quote
-        encoded_email = quote(email)
-        
-        response = client.post(f"/activities/{activity_name}/signup?email={encoded_email}")
-        
-        assert response.status_code == 200
-        
-        # Verify the email was stored correctly
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data[activity_name]["participants"]
-    
-    def test_url_encoded_email(self, client, reset_activities):
-        """Test signup with URL-encoded email"""
-        email = "test%40mergington.edu"  # URL encoded @
-        activity_name = "Empty Club"
-        
-        response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        
-        assert response.status_code == 200
+# Error responses from the signup and unregister endpoints
+@pytest.mark.parametrize("endpoint,activity_name,email,expected_status,expected_detail", [
+    ("signup", "NonExistent Club", "student@mergington.edu",
+     404, "Activity not found"),
+    ("unregister", "NonExistent Club", "student@mergington.edu",
+     404, "Activity not found"),
+    ("unregister", "Test Club", "notregistered@mergington.edu",
+     400, "Student is not signed up for this activity"),
+    ("unregister", "Empty Club", "nobody@mergington.edu",
+     400, "Student is not signed up for this activity"),
+])
+def test_error_response(client, sample_activities, signup, unregister, endpoint,
+                        activity_name, email, expected_status, expected_detail):
+    """Test unknown activities and unregistered students are rejected"""
+    call_endpoint = {"signup": signup, "unregister": unregister}[endpoint]
+    response = call_endpoint(client, activity_name, email)
+    
+    assert response.status_code == expected_status
+    data = response.json()
+    assert data["detail"] == expected_detail
+
+
+# Various email formats and edge cases
+@pytest.mark.parametrize("raw_email", [
+    "test.user+tag@mergington.edu",
+    "special%40mergington.edu",  # Literal %, sent encoded as %25
+])
+def test_signup_email_variants(client, sample_activities, signup, raw_email):
+    """Test signup with special characters, including a literal percent sign, in email"""
+    activity_name = "Empty Club"
+    
+    response = signup(client, activity_name, raw_email)
+    
+    assert response.status_code == 200
+    
+    # Verify the email was stored exactly as sent
+    assert raw_email in sample_activities[activity_name]["participants"]
+
+
+def test_url_encoded_email(client, sample_activities):
+    """Test the server decodes a percent-encoded email in the raw query string"""
+    activity_name = "Empty Club"
+    
+    # Build the query by hand: params= would encode the % sign again
+    response = client.post(f"/activities/{activity_name}/signup?email=test%40mergington.edu")
+    
+    assert response.status_code == 200
+    assert "test@mergington.edu" in sample_activities[activity_name]["participants"]
+
+
+# Various activity name formats and edge cases
+def test_activity_name_with_spaces(client, sample_activities, signup):
+    """Test activity names with spaces"""
+    email = "student@mergington.edu"
+    activity_name = "Test Club"  # Has space
+    
+    response = signup(client, activity_name, email)
+    
+    assert response.status_code == 200
+
+
+# Complete workflows and edge cases
+@pytest.mark.asyncio
+async def test_signup_and_unregister_workflow(aclient, sample_activities,
+                                              signup, unregister):
+    """Test complete signup and unregister workflow"""
+    email = "workflow@mergington.edu"
+    activity_name = "Empty Club"
+    expected_signup = f"Signed up {email} for {activity_name}"
+    expected_unregister = f"Unregistered {email} from {activity_name}"
+    
+    # Step 1: Sign up
+    signup_response = await signup(aclient, activity_name, email)
+    assert signup_response.status_code == 200
+    assert signup_response.json()["message"] == expected_signup
+    
+    # Step 2: Verify registration
+    assert email in sample_activities[activity_name]["participants"]
+    
+    # Step 3: Unregister
+    unregister_response = await unregister(aclient, activity_name, email)
+    assert unregister_response.status_code == 200
+    assert unregister_response.json()["message"] == expected_unregister
+    
+    # Step 4: Verify unregistration
+    assert email not in sample_activities[activity_name]["participants"]
 
 
-class TestActivityNameHandling:
-    """Test various activity name formats and edge cases"""
-    
-    def test_activity_name_with_spaces(self, client, reset_activities):
-        """Test activity names with spaces (URL encoded)"""
-        email = "student@mergington.edu"
-        activity_name = "Test Club"  # Has space
-        
-        # URL encode the activity name
-        encoded_name = activity_name.replace(" ", "%20")
-        response = client.post(f"/activities/{encoded_name}/signup?email={email}")
-        
+@pytest.mark.asyncio
+async def test_multiple_students_same_activity(aclient, sample_activities, signup):
+    """Test multiple students signing up for the same activity"""
+    activity_name = "Empty Club"
+    emails = ["student1@mergington.edu", "student2@mergington.edu", "student3@mergington.edu"]
+    
+    # Sign up multiple students
+    for email in emails:
+        response = await signup(aclient, activity_name, email)
         assert response.status_code == 200
+    
+    # Verify all are registered
+    participants = sample_activities[activity_name]["participants"]
+    for email in emails:
+        assert email in participants
+    
+    assert len(participants) == 3
 
 
-class TestIntegrationScenarios:
-    """Test complete workflows and edge cases"""
-    
-    def test_signup_and_unregister_workflow(self, client, reset_activities):
-        """Test complete signup and unregister workflow"""
-        email = "workflow@mergington.edu"
-        activity_name = "Empty Club"
-        
-        # Step 1: Sign up
-        signup_response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        assert signup_response.status_code == 200
-        
-        # Step 2: Verify registration
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data[activity_name]["participants"]
-        
-        # Step 3: Unregister
-        unregister_response = client.delete(f"/activities/{activity_name}/unregister?email={email}")
-        assert unregister_response.status_code == 200
-        
-        # Step 4: Verify unregistration
-        activities_response_final = client.get("/activities")
-        activities_data_final = activities_response_final.json()
-        assert email not in activities_data_final[activity_name]["participants"]
-    
-    def test_multiple_students_same_activity(self, client, reset_activities):
-        """Test multiple students signing up for the same activity"""
-        activity_name = "Empty Club"
-        emails = ["student1@mergington.edu", "student2@mergington.edu", "student3@mergington.edu"]
-        
-        # Sign up multiple students
-        for email in emails:
-            response = client.post(f"/activities/{activity_name}/signup?email={email}")
-            assert response.status_code == 200
-        
-        # Verify all are registered
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        for email in emails:
-            assert email in activities_data[activity_name]["participants"]
-        
-        assert len(activities_data[activity_name]["participants"]) == 3
-    
-    def test_student_signup_multiple_activities(self, client, reset_activities):
-        """Test one student signing up for multiple activities"""
-        email = "busy@mergington.edu"
-        activities_list = ["Test Club", "Empty Club"]
-        
-        # Sign up for multiple activities
-        for activity_name in activities_list:
-            response = client.post(f"/activities/{activity_name}/signup?email={email}")
-            assert response.status_code == 200
-        
-        # Verify registration in all activities
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        for activity_name in activities_list:
-            assert email in activities_data[activity_name]["participants"]
+@pytest.mark.asyncio
+async def test_student_signup_multiple_activities(aclient, sample_activities, signup):
+    """Test one student signing up for multiple activities"""
+    email = "busy@mergington.edu"
+    activities_list = ["Test Club", "Empty Club"]
+    
+    # Sign up for multiple activities
+    for activity_name in activities_list:
+        response = await signup(aclient, activity_name, email)
+        assert response.status_code == 200
+    
+    # Verify registration in all activities
+    for activity_name in activities_list:
+        assert email in sample_activities[activity_name]["participants"]
 
 
-class TestDataConsistency:
-    """Test data consistency and validation"""
-    
-    def test_participant_count_consistency(self, client, reset_activities):
-        """Test that participant counts remain consistent"""
-        activity_name = "Test Club"
-        
-        # Get initial count
-        initial_response = client.get("/activities")
-        initial_data = initial_response.json()
-        initial_count = len(initial_data[activity_name]["participants"])
-        
-        # Add a participant
-        email = "newparticipant@mergington.edu"
-        signup_response = client.post(f"/activities/{activity_name}/signup?email={email}")
-        assert signup_response.status_code == 200
-        
-        # Verify count increased
-        after_signup_response = client.get("/activities")
-        after_signup_data = after_signup_response.json()
-        after_signup_count = len(after_signup_data[activity_name]["participants"])
-        assert after_signup_count == initial_count + 1
-        
-        # Remove the participant
-        unregister_response = client.delete(f"/activities/{activity_name}/unregister?email={email}")
-        assert unregister_response.status_code == 200
-        
-        # Verify count returned to original
-        final_response = client.get("/activities")
-        final_data = final_response.json()
-        final_count = len(final_data[activity_name]["participants"])
-        assert final_count == initial_count
\ No newline at end of file
+# Data consistency and validation
+def test_participant_count_consistency(client, sample_activities, signup, unregister):
+    """Test that participant counts remain consistent"""
+    activity_name = "Test Club"
+    participants = sample_activities[activity_name]["participants"]
+    
+    # Get initial count
+    initial_count = len(participants)
+    
+    # Add a participant
+    email = "newparticipant@mergington.edu"
+    signup_response = signup(client, activity_name, email)
+    assert signup_response.status_code == 200
+    
+    # Verify count increased
+    assert len(participants) == initial_count + 1
+    
+    # Remove the participant
+    unregister_response = unregister(client, activity_name, email)
+    assert unregister_response.status_code == 200
+    
+    # Verify count returned to original
+    assert len(participants) == initial_count
@@ -0,0 +1,50 @@
+"""
+Benchmarks for the Mergington High School Activities API endpoints
+
+Run with ``pytest tests/test_bench.py --codspeed`` to collect measurements.
+"""
+
+ACTIVITY = "Chess Club"
+EMAIL = "bench@mergington.edu"
+
+
+def test_bench_activities_list(client, list_activities, benchmark):
+    """Benchmark listing all activities"""
+    response = benchmark(list_activities, client)
+    assert response.status_code == 200
+
+
+def test_bench_signup(client, app_module, signup, benchmark):
+    """Benchmark signing a student up for an activity"""
+    participants = app_module.activities[ACTIVITY]["participants"]
+    participant_set = app_module.get_participant_set(ACTIVITY)
+
+    def remove_student():
+        if EMAIL in participant_set:
+            participants.remove(EMAIL)
+            participant_set.remove(EMAIL)
+
+    benchmark.pedantic(
+        lambda: signup(client, ACTIVITY, EMAIL),
+        setup=remove_student,
+        rounds=100,
+    )
+    assert EMAIL in participants
+
+
+def test_bench_unregister(client, app_module, unregister, benchmark):
+    """Benchmark unregistering a student from an activity"""
+    participants = app_module.activities[ACTIVITY]["participants"]
+    participant_set = app_module.get_participant_set(ACTIVITY)
+
+    def add_student():
+        if EMAIL not in participant_set:
+            participants.append(EMAIL)
+            participant_set.add(EMAIL)
+
+    benchmark.pedantic(
+        lambda: unregister(client, ACTIVITY, EMAIL),
+        setup=add_student,
+        rounds=100,
+    )
+    assert EMAIL not in participants